@@ -3,8 +3,11 @@
 One-shot script to send FPL price changes to Telegram.
 Designed to be run by GitHub Actions cron.
 """
+import io
 import os
-import requests
+import httpx
+import orjson
+import numpy as np
 import pandas as pd
 import datetime
 import telebot
@@ -20,24 +23,29 @@ if not API_KEY:
 
 bot = telebot.TeleBot(API_KEY)
 
+# Shared HTTP/2 client so connections are kept alive between requests
+CLIENT = httpx.Client(http2=True, timeout=30.0)
+
 # FPL API endpoints
 BASE_URL = 'https://fantasy.premierleague.com/api/'
 GENERAL = 'bootstrap-static/'
 
-type_mapping = {
-    1: "GK",
-    2: "DEF",
-    3: "MID",
-    4: "FWD",
-}
+# Only the player fields used below are kept from the FPL payload
+KEEP_COLS = ["id", "web_name", "now_cost"]
+
+# Compact dtypes shared by today's and yesterday's data so id lookups match
+COST_DTYPES = {"id": "int32", "now_cost": "int16"}
 
 
 def fetch_fpl_data():
     """Fetch the latest FPL data."""
     url = BASE_URL + GENERAL
-    response = requests.get(url, timeout=30)
+    response = CLIENT.get(url)
     response.raise_for_status()
-    return pd.DataFrame(response.json()['elements'])
+    df = pd.DataFrame.from_records(
+        orjson.loads(response.content)['elements'], columns=KEEP_COLS
+    )
+    return df.astype(COST_DTYPES)
 
 
 def load_yesterday_costs():
@@ -45,9 +53,12 @@ def load_yesterday_costs():
     github_url = "https://raw.githubusercontent.com/meharpalbasi/fpl_price_change_daily/main/yesterday_costs.csv"
     
     try:
-        response = requests.get(github_url, timeout=30)
+        response = CLIENT.get(github_url)
         response.raise_for_status()
-        df = pd.read_csv(pd.io.common.StringIO(response.text))
+        df = pd.read_csv(
+            io.BytesIO(response.content),
+            dtype=COST_DTYPES,
+        )
         print(f"Loaded {len(df)} records from yesterday's data")
         return df
     except Exception as e:
@@ -64,16 +75,21 @@ def format_price_changes(df, change_type):
     if df.empty:
         return header + "None"
 
-    message_lines = []
-    for _, player in df.iterrows():
-        line = (
-            f"{player['web_name']:<15}"
-            f"£{player['now_cost']/10:<12.1f}"
-            f"£{player['prev_cost']/10:.1f}"
-        )
-        message_lines.append(line)
+    names = df['web_name'].str.ljust(15)
+    new_prices = ('£' + (df['now_cost'] / 10).round(1).astype(str)).str.ljust(13)
+    old_prices = '£' + (df['prev_cost'] / 10).round(1).astype(str)
+
+    return header + subheader + "\n".join((names + new_prices + old_prices).tolist())
 
-    return header + subheader + "\n".join(message_lines)
+
+def build_changes(idx, names, today, yesterday):
+    """Build a frame of the given player ids, most expensive first."""
+    idx = idx[np.argsort(-today[idx], kind="stable")]
+    return pd.DataFrame({
+        "web_name": names[idx],
+        "now_cost": today[idx],
+        "prev_cost": yesterday[idx],
+    })
 
 
 def get_price_changes():
@@ -84,24 +100,31 @@ def get_price_changes():
     if yesterday_df.empty:
         return None, None, "Could not load yesterday's data"
     
-    # Clean up today's data
-    players_clean_df = players_df[["id", "web_name", "now_cost", "element_type"]].copy()
-    players_clean_df["position"] = players_clean_df["element_type"].map(type_mapping)
+    ids = players_df["id"].to_numpy()
+    yest_ids = yesterday_df["id"].to_numpy()
+    size = int(max(ids.max(), yest_ids.max())) + 1
     
-    # Merge with yesterday
-    merged_df = players_clean_df.merge(
-        yesterday_df, on="id", how="left", suffixes=("", "_yest")
-    )
+    # Align both days' costs and today's names in arrays indexed by id
+    today = np.zeros(size, dtype=np.int16)
+    today[ids] = players_df["now_cost"].to_numpy()
+    yesterday = np.zeros(size, dtype=np.int16)
+    yesterday[yest_ids] = yesterday_df["now_cost"].to_numpy()
+    names = np.empty(size, dtype=object)
+    names[ids] = players_df["web_name"].to_numpy()
     
-    # Calculate daily change
-    merged_df["daily_change"] = merged_df["now_cost"] - merged_df["now_cost_yest"]
-    merged_df["prev_cost"] = merged_df["now_cost_yest"]
+    # Only compare players present on both days
+    in_both = np.zeros(size, dtype=bool)
+    in_both[ids] = True
+    in_yesterday = np.zeros(size, dtype=bool)
+    in_yesterday[yest_ids] = True
+    in_both &= in_yesterday
     
-    # Filter changed players
-    changed = merged_df[merged_df["daily_change"] != 0].copy()
+    # Calculate daily change and pick out changed players
+    delta = np.where(in_both, today - yesterday, 0)
+    changed = np.flatnonzero(delta)
     
-    rises = changed[changed["daily_change"] > 0].sort_values("now_cost", ascending=False)
-    falls = changed[changed["daily_change"] < 0].sort_values("now_cost", ascending=False)
+    rises = build_changes(changed[delta[changed] > 0], names, today, yesterday)
+    falls = build_changes(changed[delta[changed] < 0], names, today, yesterday)
     
     return rises, falls, None
 